@@ -5,7 +5,17 @@ setup(
     version="0.1",
     packages=find_packages(),
     install_requires=[
-        'websockets',
+        'aiohttp',
         'requests',
+        'numpy',
+        'sortedcontainers',
     ],
+    extras_require={
+        # Optional accelerators; everything falls back to pure Python without them
+        'fast': [
+            'numba',
+            'pysimdjson',
+            'orjson',
+        ],
+    },
 ) 
\ No newline at end of file
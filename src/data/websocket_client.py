@@ -1,75 +1,164 @@
 import json
 import logging
+import time
+import queue
 import asyncio
-import websockets
-from datetime import datetime
+import aiohttp
+import numpy as np
 from collections import deque
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from sortedcontainers import SortedDict
+from typing import Dict, Optional, Union
 from src.utils.vpn_handler import VPNHandler
 
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    import orjson
+    # Accepts bytes or str and is considerably faster than the stdlib parser
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 logger = logging.getLogger(__name__)
 
-class OrderBookEntry:
-    def __init__(self, price: float, size: float):
-        self.price = price
-        self.size = size
+def _to_levels(rows) -> np.ndarray:
+    """Convert OKX [price, size, ...] string rows into an (n, 2) float64 array"""
+    if not rows:
+        return np.empty((0, 2), dtype=np.float64)
+    return np.array(rows, dtype=np.float64)[:, :2]
 
 class OrderBook:
     def __init__(self, max_depth: int = 100):
-        self.asks: List[OrderBookEntry] = []
-        self.bids: List[OrderBookEntry] = []
+        # Full book as price -> size, kept sorted so deltas are O(log n) each
+        self._asks = SortedDict()
+        self._bids = SortedDict()
+        
+        # Top max_depth levels as parallel price/size arrays (best level first)
+        self.ask_prices = np.empty(max_depth, dtype=np.float64)
+        self.ask_sizes = np.empty(max_depth, dtype=np.float64)
+        self.bid_prices = np.empty(max_depth, dtype=np.float64)
+        self.bid_sizes = np.empty(max_depth, dtype=np.float64)
+        self.n_asks = 0
+        self.n_bids = 0
+        
+        # Cumulative size from the best level outwards, rebuilt on each update
+        self._ask_cumsize = np.empty(0, dtype=np.float64)
+        self._bid_cumsize = np.empty(0, dtype=np.float64)
+        # Bids are sorted descending; negated prices give an ascending key for searchsorted
+        self._neg_bid_prices = np.empty(0, dtype=np.float64)
         self.max_depth = max_depth
-        self.last_update: Optional[datetime] = None
+        self.last_update: Optional[float] = None  # Wall-clock seconds
         self.callbacks = []
+        
+        # Top of book as of the last callback fan-out
+        self._last_mid = 0.0
+        self._last_spread = 0.0
     
     def add_callback(self, callback):
         """Add callback for orderbook updates"""
         self.callbacks.append(callback)
     
-    def update(self, asks: List[List[float]], bids: List[List[float]]):
-        """Update orderbook with new data"""
-        self.asks = [OrderBookEntry(price=ask[0], size=ask[1]) 
-                    for ask in asks[:self.max_depth]]
-        self.bids = [OrderBookEntry(price=bid[0], size=bid[1]) 
-                    for bid in bids[:self.max_depth]]
-        self.last_update = datetime.now()
+    def update(self, asks: np.ndarray, bids: np.ndarray, snapshot: bool = True) -> bool:
+        """
+        Apply a full snapshot or an incremental L2 update
+        
+        Returns:
+            True if the mid price or spread changed, False otherwise
+        """
+        if snapshot:
+            self._asks.clear()
+            self._bids.clear()
+        self._apply(self._asks, asks)
+        self._apply(self._bids, bids)
+        
+        depth = self.max_depth
+        self.n_asks = self._fill(self.ask_prices, self.ask_sizes,
+                                 self._asks.keys()[:depth], self._asks.values()[:depth])
+        self.n_bids = self._fill(self.bid_prices, self.bid_sizes,
+                                 self._bids.keys()[-depth:][::-1], self._bids.values()[-depth:][::-1])
+        self._ask_cumsize = np.cumsum(self.ask_sizes[:self.n_asks])
+        self._bid_cumsize = np.cumsum(self.bid_sizes[:self.n_bids])
+        self._neg_bid_prices = -self.bid_prices[:self.n_bids]
+        self.last_update = time.time()
+        
+        # Skip the fan-out when the visible top of book hasn't moved
+        mid = self.get_mid_price()
+        spread = self.get_spread()
+        if abs(mid - self._last_mid) < 1e-8 and abs(spread - self._last_spread) < 1e-8:
+            return False
+        self._last_mid = mid
+        self._last_spread = spread
         
         # Notify callbacks
         for callback in self.callbacks:
             callback(self)
+        return True
+    
+    @staticmethod
+    def _apply(book: SortedDict, levels: np.ndarray):
+        """Set or delete (size == 0) each [price, size] level on one side"""
+        for price, size in levels.tolist():
+            if size == 0.0:
+                book.pop(price, None)
+            else:
+                book[price] = size
+    
+    @staticmethod
+    def _fill(prices: np.ndarray, sizes: np.ndarray, level_prices: list, level_sizes: list) -> int:
+        """Copy the best levels of one side into its arrays"""
+        n = len(level_prices)
+        if n:
+            prices[:n] = level_prices
+            sizes[:n] = level_sizes
+        return n
     
     def get_mid_price(self) -> float:
         """Calculate mid price"""
-        if not self.asks or not self.bids:
+        if not self.n_asks or not self.n_bids:
             return 0.0
-        return (self.asks[0].price + self.bids[0].price) / 2
+        return float(self.ask_prices[0] + self.bid_prices[0]) * 0.5
     
     def get_spread(self) -> float:
         """Calculate spread"""
-        if not self.asks or not self.bids:
+        if not self.n_asks or not self.n_bids:
             return 0.0
-        return self.asks[0].price - self.bids[0].price
+        return float(self.ask_prices[0] - self.bid_prices[0])
     
     def get_depth(self, side: str, price_level: float) -> float:
         """Calculate cumulative depth up to price level"""
-        entries = self.asks if side.lower() == 'ask' else self.bids
-        cum_size = 0.0
-        
-        for entry in entries:
-            if (side.lower() == 'ask' and entry.price <= price_level) or \
-               (side.lower() == 'bid' and entry.price >= price_level):
-                cum_size += entry.size
+        if side.lower() == 'ask':
+            idx = np.searchsorted(self.ask_prices[:self.n_asks], price_level, side='right')
+            cumsize = self._ask_cumsize
+        else:
+            idx = np.searchsorted(self._neg_bid_prices, -price_level, side='right')
+            cumsize = self._bid_cumsize
         
-        return cum_size
+        return float(cumsize[idx - 1]) if idx > 0 else 0.0
 
 class WebSocketClient:
     def __init__(self, url: str = "wss://ws.okx.com:8443/ws/v5/public"):
         self.url = url
         self.orderbook = OrderBook()
         self.connected = False
+        self._session: Optional[aiohttp.ClientSession] = None
         self.processing_times = deque(maxlen=100)
+        self._latency_sum = 0.0
+        self._last_seq_id = None
         self.vpn_handler = VPNHandler()
         
+        # Parsing runs on a single worker so this client's simdjson parser and
+        # the orderbook are only ever touched from one thread
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        # Reused across messages so simdjson can recycle its internal buffers
+        self._parser = simdjson.Parser() if simdjson else None
+        
+        # Processed results for the UI thread to drain
+        self.updates = queue.Queue()
+        
     async def connect(self):
         """Establish WebSocket connection"""
         # Check VPN connection first
@@ -79,12 +168,15 @@ class WebSocketClient:
             return False
             
         try:
-            self.ws = await websockets.connect(self.url)
+            self._session = aiohttp.ClientSession()
+            # OKX book messages are small, so permessage-deflate costs more CPU than it saves
+            self.ws = await self._session.ws_connect(self.url, heartbeat=20, compress=0)
             self.connected = True
             logger.info(f"Connected to WebSocket at {self.url}")
             return True
         except Exception as e:
             logger.error(f"Failed to connect to WebSocket: {str(e)}")
+            await self._close_session()
             return False
     
     async def subscribe(self):
@@ -97,35 +189,69 @@ class WebSocketClient:
                     "instId": "BTC-USDT-SWAP"
                 }]
             }
-            await self.ws.send(json.dumps(subscribe_msg))
+            await self.ws.send_str(json.dumps(subscribe_msg))
             logger.info("Subscribed to OKX orderbook updates")
         except Exception as e:
             logger.error(f"Failed to subscribe: {str(e)}")
     
-    async def process_message(self, message: str) -> Dict:
-        """Process incoming WebSocket message"""
+    async def process_message(self, message: Union[str, bytes]) -> Dict:
+        """Process incoming WebSocket message off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self._process_sync, message)
+    
+    def _process_sync(self, message: Union[str, bytes]) -> Dict:
+        """Parse a message and apply it to the orderbook (runs on the worker thread)"""
         try:
-            start_time = datetime.now()
+            start_time = time.perf_counter_ns()
             
-            data = json.loads(message)
+            if self._parser is not None:
+                # simdjson reads str via its cached UTF-8 buffer and bytes in place,
+                # so neither needs an intermediate copy
+                data = self._parser.parse(message)
+            else:
+                data = _loads(message)
             if 'data' in data:
                 orderbook_data = data['data'][0]
                 if 'asks' in orderbook_data and 'bids' in orderbook_data:
-                    # Convert string prices and sizes to float
-                    asks = [[float(price), float(size)] for price, size, *_ in orderbook_data['asks']]
-                    bids = [[float(price), float(size)] for price, size, *_ in orderbook_data['bids']]
+                    # Drop messages we've already applied
+                    seq_id = orderbook_data.get('seqId')
+                    if seq_id is not None and seq_id == self._last_seq_id:
+                        return {}
+                    self._last_seq_id = seq_id
                     
-                    self.orderbook.update(asks, bids)
+                    if self._parser is not None:
+                        # Jump straight to the level arrays instead of walking the document
+                        raw_asks = data.at_pointer('/data/0/asks').as_list()
+                        raw_bids = data.at_pointer('/data/0/bids').as_list()
+                    else:
+                        raw_asks = orderbook_data['asks']
+                        raw_bids = orderbook_data['bids']
+                    
+                    # Convert string prices and sizes to float in one pass per side
+                    asks = _to_levels(raw_asks)
+                    bids = _to_levels(raw_bids)
+                    
+                    # OKX sends one snapshot after subscribing, then incremental updates
+                    orderbook = self.orderbook
+                    changed = orderbook.update(asks, bids, snapshot=data.get('action') != 'update')
                     
                     # Calculate processing time
-                    processing_time = (datetime.now() - start_time).total_seconds() * 1000
-                    self.processing_times.append(processing_time)
+                    processing_time = (time.perf_counter_ns() - start_time) / 1e6
+                    self._push_latency(processing_time)
+                    
+                    # Nothing for the UI to redraw if the top of book is unchanged
+                    if not changed:
+                        return {}
                     
+                    # Snapshot everything the UI shows here, on the thread that owns the
+                    # book, so the Tk thread never reads it mid-update
+                    mid_price = orderbook.get_mid_price()
                     return {
-                        'mid_price': self.orderbook.get_mid_price(),
-                        'spread': self.orderbook.get_spread(),
+                        'mid_price': mid_price,
+                        'spread': orderbook.get_spread(),
+                        'depth': orderbook.get_depth('bid', mid_price),
                         'processing_time': processing_time,
-                        'timestamp': data.get('ts', datetime.now().timestamp() * 1000)
+                        'timestamp': data.get('ts', time.time() * 1000)
                     }
             
             return {}
@@ -134,19 +260,33 @@ class WebSocketClient:
             logger.error(f"Error processing message: {str(e)}")
             return {}
     
+    def _push_latency(self, latency_ms: float):
+        """Record a processing time, keeping the window sum up to date"""
+        if len(self.processing_times) == self.processing_times.maxlen:
+            self._latency_sum -= self.processing_times[0]
+        self.processing_times.append(latency_ms)
+        self._latency_sum += latency_ms
+    
     def get_average_latency(self) -> float:
         """Calculate average processing latency"""
         if not self.processing_times:
             return 0.0
-        return sum(self.processing_times) / len(self.processing_times)
+        return self._latency_sum / len(self.processing_times)
     
     async def close(self):
         """Close WebSocket connection"""
         if self.connected:
             await self.ws.close()
+            await self._close_session()
             self.connected = False
             logger.info("WebSocket connection closed")
     
+    async def _close_session(self):
+        """Close the underlying HTTP session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
     async def run(self):
         """Main run loop"""
         while True:
@@ -157,12 +297,24 @@ class WebSocketClient:
                         continue
                     await self.subscribe()
                 
-                async for message in self.ws:
-                    await self.process_message(message)
-                    
-            except websockets.ConnectionClosed:
+                # Bind hot-path lookups once rather than on every message
+                run_in_executor = asyncio.get_running_loop().run_in_executor
+                pool = self._pool
+                process = self._process_sync
+                put_update = self.updates.put
+                
+                async for msg in self.ws:
+                    # Binary frames are passed through undecoded
+                    if msg.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                        result = await run_in_executor(pool, process, msg.data)
+                        if result:
+                            put_update(result)
+                    elif msg.type == aiohttp.WSMsgType.ERROR:
+                        break
+                
+                # Iteration ends once the connection is closed or errors out
                 logger.warning("WebSocket connection closed. Attempting to reconnect...")
-                self.connected = False
+                
             except Exception as e:
                 logger.error(f"Error in run loop: {str(e)}")
                 await asyncio.sleep(5)  # Wait before retrying
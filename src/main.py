@@ -1,6 +1,4 @@
 import logging
-import asyncio
-import tkinter as tk
 from src.ui.main_window import MainWindow
 from src.utils.vpn_handler import VPNHandler
 
@@ -10,7 +8,7 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
-async def main():
+def main():
     # Check VPN connection first
     vpn_handler = VPNHandler()
     vpn_status = vpn_handler.check_connection()
@@ -19,21 +17,13 @@ async def main():
         print(f"VPN Error: {vpn_status['message']}")
         return
     
-    # Create main window
+    # Create main window (starts the WebSocket client on its own thread)
     root = MainWindow()
-    
-    # Create async event loop for tkinter
-    async def update_gui():
-        while True:
-            root.update()
-            await asyncio.sleep(1/60)  # 60 FPS
-    
-    # Run GUI and WebSocket client together
-    await update_gui()
+    root.mainloop()
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        main()
     except KeyboardInterrupt:
         print("\nApplication terminated by user")
     except Exception as e:
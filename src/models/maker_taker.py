@@ -1,5 +1,5 @@
+import math
 import numpy as np
-from sklearn.linear_model import LogisticRegression
 from typing import Dict, Optional
 import logging
 
@@ -7,7 +7,7 @@ logger = logging.getLogger(__name__)
 
 class MakerTakerModel:
     def __init__(self):
-        self.model = LogisticRegression(random_state=42)
+        self.model = None  # Created on first train() to avoid importing sklearn up front
         self.is_trained = False
         
         # Default feature weights (can be updated with training)
@@ -27,6 +27,9 @@ class MakerTakerModel:
             labels: Binary array (1 for maker, 0 for taker)
         """
         try:
+            from sklearn.linear_model import LogisticRegression
+            
+            self.model = LogisticRegression(random_state=42)
             self.model.fit(features, labels)
             self.is_trained = True
             logger.info("Maker/Taker model trained successfully")
@@ -55,14 +58,12 @@ class MakerTakerModel:
         try:
             # Normalize inputs
             norm_spread = spread / price
-            norm_depth = np.log1p(market_depth)
+            norm_depth = math.log1p(market_depth)
             norm_size = order_size / market_depth if market_depth > 0 else 1.0
             
-            # Feature vector
-            features = np.array([[norm_spread, norm_depth, volatility, norm_size]])
-            
-            if self.is_trained:
+            if self.is_trained and self.model is not None:
                 # Use trained model
+                features = np.array([[norm_spread, norm_depth, volatility, norm_size]])
                 maker_prob = self.model.predict_proba(features)[0][1]
             else:
                 # Use simple linear combination with sigmoid activation
@@ -72,7 +73,12 @@ class MakerTakerModel:
                     self.vol_weight * volatility +
                     self.size_weight * norm_size
                 )
-                maker_prob = 1 / (1 + np.exp(-z))
+                # Scalar math avoids ndarray allocation and ufunc dispatch per call
+                if z >= 0:
+                    maker_prob = 1.0 / (1.0 + math.exp(-z))
+                else:
+                    exp_z = math.exp(z)
+                    maker_prob = exp_z / (1.0 + exp_z)
             
             taker_prob = 1 - maker_prob
             
@@ -1,9 +1,39 @@
-import numpy as np
+import math
 from typing import Dict, Optional
 import logging
+from src.utils.jit import njit
 
 logger = logging.getLogger(__name__)
 
+@njit(cache=True, fastmath=True)
+def _ac_impact(quantity, price, vol, vol_ref, perm, temp, depth):
+    """Numeric core of the Almgren-Chriss impact calculation"""
+    order_value = quantity * price
+    
+    # Temporary impact: η|v|^γ with γ = 0.5
+    temp_impact = temp * math.sqrt(quantity) * price
+    
+    # Permanent impact: θv
+    perm_impact = perm * quantity * price
+    
+    # Adjust impacts based on volatility
+    vol_adjustment = vol / vol_ref
+    temp_impact *= vol_adjustment
+    perm_impact *= vol_adjustment
+    
+    # Adjust for market depth (0 means unknown)
+    if depth > 0:
+        depth_adjustment = math.sqrt(quantity / depth)
+        temp_impact *= depth_adjustment
+        perm_impact *= depth_adjustment
+    
+    total_impact = temp_impact + perm_impact
+    impact_bps = (total_impact / order_value) * 10000  # Convert to basis points
+    return temp_impact, perm_impact, total_impact, impact_bps
+
+# Compile at import so the first UI-driven call doesn't pay JIT latency
+_ac_impact(1.0, 1.0, 0.3, 0.3, 2.5e-6, 2.5e-6, 0.0)
+
 class AlmgrenChrissModel:
     def __init__(self):
         # Model parameters (can be calibrated based on historical data)
@@ -32,30 +62,12 @@ class AlmgrenChrissModel:
             # Use provided volatility if available
             vol = volatility if volatility is not None else self.volatility
             
-            # Calculate order value
-            order_value = quantity * price
-            
-            # Temporary impact calculation
-            # η|v|^γ where η is temporary_impact, v is volume, γ typically = 0.5
-            temp_impact = self.temporary_impact * np.sqrt(quantity) * price
-            
-            # Permanent impact calculation
-            # θv where θ is permanent_impact, v is volume
-            perm_impact = self.permanent_impact * quantity * price
-            
-            # Adjust impacts based on volatility
-            vol_adjustment = vol / self.volatility
-            temp_impact *= vol_adjustment
-            perm_impact *= vol_adjustment
-            
-            # Adjust for market depth if provided
-            if market_depth is not None and market_depth > 0:
-                depth_adjustment = np.sqrt(quantity / market_depth)
-                temp_impact *= depth_adjustment
-                perm_impact *= depth_adjustment
+            depth = market_depth if market_depth is not None else 0.0
             
-            total_impact = temp_impact + perm_impact
-            impact_bps = (total_impact / order_value) * 10000  # Convert to basis points
+            temp_impact, perm_impact, total_impact, impact_bps = _ac_impact(
+                quantity, price, vol, self.volatility,
+                self.permanent_impact, self.temporary_impact, depth
+            )
             
             return {
                 'temporary_impact': temp_impact,
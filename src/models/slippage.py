@@ -1,5 +1,18 @@
+import math
 from typing import Optional, Union, Literal
-import numpy as np
+from src.utils.jit import njit
+
+@njit(cache=True, fastmath=True)
+def _volume_slippage(price, volume, market_volume, impact_factor):
+    """Numeric core of the volume-based slippage calculation"""
+    if market_volume:
+        # Square root formula for price impact
+        return price * impact_factor * math.sqrt(volume / market_volume)
+    # Linear impact when market volume unknown
+    return price * impact_factor * (volume / 1000)  # Arbitrary scaling
+
+# Compile at import so the first call doesn't pay JIT latency
+_volume_slippage(1.0, 1.0, 1.0, 0.1)
 
 class SlippageModel:
     """
@@ -33,6 +46,14 @@ class SlippageModel:
         self.volume_impact_factor = volume_impact_factor
         self.min_slippage = min_slippage
         self.max_slippage = max_slippage
+        self._max_slippage = max_slippage if max_slippage is not None else math.inf
+        
+        # Resolve the model type once so each calculation is a single call
+        self._slip_fn = {
+            "fixed": lambda price, volume, market_volume, is_buy: self._calculate_fixed_slippage(is_buy),
+            "percentage": lambda price, volume, market_volume, is_buy: self._calculate_percentage_slippage(price, is_buy),
+            "volume": self._calculate_volume_slippage
+        }.get(model_type, lambda price, volume, market_volume, is_buy: 0.0)
 
     def calculate_slippage(
         self,
@@ -53,19 +74,10 @@ class SlippageModel:
         Returns:
             float: Price after slippage application
         """
-        slippage = 0.0
+        slippage = self._slip_fn(price, volume, market_volume, is_buy)
         
-        if self.model_type == "fixed":
-            slippage = self._calculate_fixed_slippage(is_buy)
-        elif self.model_type == "percentage":
-            slippage = self._calculate_percentage_slippage(price, is_buy)
-        elif self.model_type == "volume":
-            slippage = self._calculate_volume_slippage(price, volume, market_volume, is_buy)
-            
-        # Apply min/max bounds if configured
-        if self.max_slippage is not None:
-            slippage = min(slippage, self.max_slippage)
-        slippage = max(slippage, self.min_slippage)
+        # Apply min/max bounds (max is infinite when not configured)
+        slippage = max(min(slippage, self._max_slippage), self.min_slippage)
         
         return price + (slippage if is_buy else -slippage)
 
@@ -89,12 +101,8 @@ class SlippageModel:
         Uses square root formula if market_volume is available,
         otherwise falls back to linear impact.
         """
-        if market_volume:
-            # Square root formula for price impact
-            volume_ratio = volume / market_volume
-            slippage = price * self.volume_impact_factor * np.sqrt(volume_ratio)
-        else:
-            # Linear impact when market volume unknown
-            slippage = price * self.volume_impact_factor * (volume / 1000)  # Arbitrary scaling
-            
-        return slippage 
+        return _volume_slippage(
+            price, volume,
+            market_volume if market_volume is not None else 0.0,
+            self.volume_impact_factor
+        )
@@ -1,78 +1,82 @@
-import subprocess
+import asyncio
 import sys
-import time
-import signal
 import os
 from datetime import datetime
 
-def start_main_application():
+async def start_main_application():
     """Start the main application process."""
-    process = subprocess.Popen([sys.executable, 'src/main.py'],
-                             stdout=subprocess.PIPE,
-                             stderr=subprocess.PIPE)
-    return process
+    return await asyncio.create_subprocess_exec(sys.executable, 'src/main.py',
+                                                stdout=asyncio.subprocess.PIPE,
+                                                stderr=asyncio.subprocess.PIPE)
 
-def start_performance_collector(target_pid, duration=300):
+async def start_performance_collector(target_pid, duration=300):
     """Start the performance collector process."""
-    return subprocess.Popen([sys.executable, 'src/utils/performance_collector.py', str(target_pid), str(duration)],
-                          stdout=subprocess.PIPE,
-                          stderr=subprocess.PIPE)
+    return await asyncio.create_subprocess_exec(sys.executable, 'src/utils/performance_collector.py',
+                                                str(target_pid), str(duration),
+                                                stdout=asyncio.subprocess.PIPE,
+                                                stderr=asyncio.subprocess.PIPE)
 
-def monitor_processes(collector_process, main_process):
+async def _drain(stream, label):
+    """Print each line from a process stream as it arrives."""
+    async for line in stream:
+        print(f"{label}: {line.decode().strip()}")
+
+async def _watch(process, label, name):
+    """Drain a process's output until it exits."""
+    # stderr is drained too so a full pipe can never block the child
+    await asyncio.gather(_drain(process.stdout, label), _drain(process.stderr, label))
+    await process.wait()
+    print(f"{name} has stopped!")
+
+async def monitor_processes(collector_process, main_process):
     """Monitor both processes and handle their output."""
+    watchers = [
+        asyncio.create_task(_watch(collector_process, "Collector", "Performance collector")),
+        asyncio.create_task(_watch(main_process, "Main App", "Main application")),
+    ]
     try:
-        while True:
-            # Check if either process has terminated
-            if collector_process.poll() is not None:
-                print("Performance collector has stopped!")
-                break
-            if main_process.poll() is not None:
-                print("Main application has stopped!")
-                break
-            
-            # Print output from both processes
-            collector_output = collector_process.stdout.readline()
-            if collector_output:
-                print(f"Collector: {collector_output.decode().strip()}")
-            
-            main_output = main_process.stdout.readline()
-            if main_output:
-                print(f"Main App: {main_output.decode().strip()}")
-            
-            time.sleep(0.1)
-    except KeyboardInterrupt:
-        print("\nReceived interrupt signal. Shutting down gracefully...")
+        # Stop as soon as either process terminates
+        await asyncio.wait(watchers, return_when=asyncio.FIRST_COMPLETED)
     finally:
+        for watcher in watchers:
+            watcher.cancel()
+
         # Ensure both processes are terminated
         for process in [collector_process, main_process]:
-            if process.poll() is None:
+            if process.returncode is None:
                 process.terminate()
                 try:
-                    process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
+                    await asyncio.wait_for(process.wait(), timeout=5)
+                except asyncio.TimeoutError:
                     process.kill()
 
-def main():
-    print(f"Starting performance analysis session at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    
-    # Ensure the performance data directory exists
-    os.makedirs("docs/performance_data", exist_ok=True)
-    
+async def run_session():
     # Start main application first
-    main_process = start_main_application()
+    main_process = await start_main_application()
     print(f"Started main application (PID: {main_process.pid})...")
-    
-    time.sleep(2)  # Give main app a moment to initialize
-    
+
+    await asyncio.sleep(2)  # Give main app a moment to initialize
+
     # Start performance collector with main app's PID
-    collector_process = start_performance_collector(main_process.pid)
+    collector_process = await start_performance_collector(main_process.pid)
     print("Started performance collector...")
-    
+
     # Monitor and handle process output
-    monitor_processes(collector_process, main_process)
-    
+    await monitor_processes(collector_process, main_process)
+
+def main():
+    print(f"Starting performance analysis session at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    # Ensure the performance data directory exists
+    os.makedirs("docs/performance_data", exist_ok=True)
+
+    try:
+        asyncio.run(run_session())
+    except KeyboardInterrupt:
+        print("\nReceived interrupt signal. Shutting down gracefully...")
+
     print(f"\nSession completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("Performance data has been saved to docs/performance_data/")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -1,6 +1,8 @@
 import logging
+import math
 import tkinter as tk
 from tkinter import ttk
+from src.utils.fee_calculator import TIER_NAMES
 
 logger = logging.getLogger(__name__)
 
@@ -8,6 +10,7 @@ class InputPanel(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self.on_parameters_updated = None
+        self._pending_after = None
         self.setup_ui()
         
     def setup_ui(self):
@@ -57,14 +60,7 @@ class InputPanel(ttk.Frame):
         
         # Fee tier selection
         ttk.Label(form_frame, text="Fee Tier:").grid(row=4, column=0, sticky=tk.W, pady=5)
-        self.fee_tier_combo = ttk.Combobox(form_frame, values=[
-            "VIP 0 (0.10%)",
-            "VIP 1 (0.08%)",
-            "VIP 2 (0.07%)",
-            "VIP 3 (0.06%)",
-            "VIP 4 (0.05%)",
-            "VIP 5 (0.04%)"
-        ], state="readonly")
+        self.fee_tier_combo = ttk.Combobox(form_frame, values=TIER_NAMES, state="readonly")
         self.fee_tier_combo.current(0)
         self.fee_tier_combo.grid(row=4, column=1, sticky=tk.EW, pady=5)
         
@@ -100,13 +96,22 @@ class InputPanel(ttk.Frame):
         except ValueError:
             quantity = 100
             volatility = 0.5
-            
+        
+        # The cost models take square roots of the quantity, so reject negatives and NaN/inf
+        if not (math.isfinite(quantity) and quantity >= 0):
+            logger.warning(f"Invalid quantity {quantity}, using 0")
+            quantity = 0.0
+        if not math.isfinite(volatility):
+            logger.warning(f"Invalid volatility {volatility}, using 0.5")
+            volatility = 0.5
+        
         return {
             'asset': self.asset_combo.get(),
             'order_type': self.order_type.get(),
             'quantity': quantity,
             'volatility': volatility,
-            'fee_tier': self.fee_tier_combo.get()
+            'fee_tier': self.fee_tier_combo.get(),
+            'fee_tier_index': max(self.fee_tier_combo.current(), 0)  # Index into TIER_NAMES
         }
     
     def on_simulate(self):
@@ -118,4 +123,12 @@ class InputPanel(ttk.Frame):
     
     def on_parameter_change(self):
         """Handle parameter changes"""
-        self.on_simulate()  # Auto-update on any parameter change 
\ No newline at end of file
+        # Coalesce rapid edits (e.g. typing) into a single simulate call
+        if self._pending_after is not None:
+            self.after_cancel(self._pending_after)
+        self._pending_after = self.after(150, self._do_simulate)
+    
+    def _do_simulate(self):
+        """Run the debounced simulation"""
+        self._pending_after = None
+        self.on_simulate() 
\ No newline at end of file
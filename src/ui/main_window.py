@@ -1,7 +1,9 @@
 import logging
 import tkinter as tk
 from tkinter import ttk, messagebox
+import queue
 import asyncio
+import threading
 from src.ui.input_panel import InputPanel
 from src.ui.output_panel import OutputPanel
 from src.data.websocket_client import WebSocketClient
@@ -10,6 +12,12 @@ from src.utils.vpn_handler import VPNHandler
 logger = logging.getLogger(__name__)
 
 class MarketDataPanel(ttk.Frame):
+    # Bound str.format methods, so the format specs are parsed once
+    _PRICE_FMT = "Price: {:.2f} USDT".format
+    _SPREAD_FMT = "Spread: {:.4f} USDT".format
+    _DEPTH_FMT = "Market Depth: {:.2f} BTC".format
+    _LATENCY_FMT = "Latency: {:.2f} ms".format
+    
     def __init__(self, parent):
         super().__init__(parent)
         self.setup_ui()
@@ -23,29 +31,37 @@ class MarketDataPanel(ttk.Frame):
         data_frame = ttk.Frame(self)
         data_frame.pack(fill=tk.X, padx=10)
         
+        # Labels read their text from these variables, so updates skip config()
+        self.price_var = tk.StringVar(value="Price: --")
+        self.spread_var = tk.StringVar(value="Spread: --")
+        self.depth_var = tk.StringVar(value="Market Depth: --")
+        self.latency_var = tk.StringVar(value="Latency: --")
+        self.status_var = tk.StringVar(value="Status: Disconnected")
+        
         # Labels for market data
-        self.price_label = ttk.Label(data_frame, text="Price: --", font=('Helvetica', 12))
+        self.price_label = ttk.Label(data_frame, textvariable=self.price_var, font=('Helvetica', 12))
         self.price_label.pack(anchor=tk.W, pady=2)
         
-        self.spread_label = ttk.Label(data_frame, text="Spread: --", font=('Helvetica', 12))
+        self.spread_label = ttk.Label(data_frame, textvariable=self.spread_var, font=('Helvetica', 12))
         self.spread_label.pack(anchor=tk.W, pady=2)
         
-        self.depth_label = ttk.Label(data_frame, text="Market Depth: --", font=('Helvetica', 12))
+        self.depth_label = ttk.Label(data_frame, textvariable=self.depth_var, font=('Helvetica', 12))
         self.depth_label.pack(anchor=tk.W, pady=2)
         
-        self.latency_label = ttk.Label(data_frame, text="Latency: --", font=('Helvetica', 12))
+        self.latency_label = ttk.Label(data_frame, textvariable=self.latency_var, font=('Helvetica', 12))
         self.latency_label.pack(anchor=tk.W, pady=2)
         
         # Connection status
-        self.status_label = ttk.Label(data_frame, text="Status: Disconnected", font=('Helvetica', 12))
+        self.status_label = ttk.Label(data_frame, textvariable=self.status_var, font=('Helvetica', 12))
         self.status_label.pack(anchor=tk.W, pady=2)
     
-    def update_market_data(self, orderbook):
-        """Update market data display"""
-        self.price_label.config(text=f"Price: {orderbook.get_mid_price():.2f} USDT")
-        self.spread_label.config(text=f"Spread: {orderbook.get_spread():.4f} USDT")
-        self.depth_label.config(text=f"Market Depth: {orderbook.get_depth('bid', orderbook.get_mid_price()):.2f} BTC")
-        self.status_label.config(text="Status: Connected")
+    def update_market_data(self, market_data):
+        """Draw a processed market data update"""
+        self.price_var.set(self._PRICE_FMT(market_data['mid_price']))
+        self.spread_var.set(self._SPREAD_FMT(market_data['spread']))
+        self.depth_var.set(self._DEPTH_FMT(market_data['depth']))
+        self.latency_var.set(self._LATENCY_FMT(market_data['processing_time']))
+        self.status_var.set("Status: Connected")
 
 class MainWindow(tk.Tk):
     def __init__(self):
@@ -83,10 +99,54 @@ class MainWindow(tk.Tk):
     def setup_market_data(self):
         """Initialize market data connection"""
         self.ws_client = WebSocketClient()
-        self.ws_client.orderbook.add_callback(self.market_panel.update_market_data)
         
-        # Start WebSocket connection in background
-        asyncio.create_task(self.ws_client.run())
+        # The client runs on its own thread and event loop so network I/O never
+        # competes with the Tk mainloop; results come back through ws_client.updates
+        self._ws_loop = asyncio.new_event_loop()
+        self._ws_thread = threading.Thread(target=self._ws_worker, name="ws-client", daemon=True)
+        self._ws_thread.start()
+        self._poll_updates()
+    
+    def _ws_worker(self):
+        """Run the WebSocket client until its tasks are cancelled"""
+        loop = self._ws_loop
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.ws_client.run())
+        except asyncio.CancelledError:
+            pass
+        finally:
+            loop.close()
+    
+    def _stop_ws(self):
+        """Cancel the client's tasks (runs on the WebSocket thread)"""
+        for task in asyncio.all_tasks():
+            task.cancel()
+    
+    def _poll_updates(self):
+        """Drain WebSocket results and redraw at ~30 FPS on the Tk thread"""
+        self.drain_updates()
+        self.after(33, self._poll_updates)
+    
+    def destroy(self):
+        # Let the client close its connection; the thread is a daemon so exit never waits on it
+        if self._ws_loop.is_running():
+            self._ws_loop.call_soon_threadsafe(self._stop_ws)
+        super().destroy()
+    
+    def drain_updates(self):
+        """Apply market data processed by the WebSocket worker since the last frame"""
+        latest = None
+        while True:
+            try:
+                latest = self.ws_client.updates.get_nowait()
+            except queue.Empty:
+                break
+        
+        # Only the newest update is drawn, so price, spread, depth and latency
+        # always come from the same message
+        if latest is not None:
+            self.market_panel.update_market_data(latest)
     
     def check_vpn(self):
         """Check VPN connection"""
@@ -102,4 +162,4 @@ class MainWindow(tk.Tk):
     
     def update_latency(self, latency_ms):
         """Update latency display"""
-        self.market_panel.latency_label.config(text=f"Latency: {latency_ms:.2f} ms") 
\ No newline at end of file
+        self.market_panel.latency_var.set(MarketDataPanel._LATENCY_FMT(latency_ms)) 
\ No newline at end of file
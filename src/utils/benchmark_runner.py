@@ -1,10 +1,26 @@
 import time
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 import os
-import pandas as pd
+
+PLOT_STYLE = 'seaborn-v0_8-whitegrid'
+
+def _pyplot():
+    """Import pyplot on first use, configured for file output"""
+    import matplotlib
+    matplotlib.use('Agg')  # File output only, no GUI canvas
+    import matplotlib.pyplot as plt
+    plt.style.use(PLOT_STYLE)
+    return plt
+
+# One record per benchmarked order size
+RESULT_DTYPE = [
+    ('order_size', 'f8'),
+    ('processing_time', 'f8'),
+    ('memory_usage', 'f8'),
+    ('accuracy', 'f8'),
+    ('slippage', 'f8')
+]
 
 class BenchmarkRunner:
     def __init__(self):
@@ -12,63 +28,52 @@ class BenchmarkRunner:
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
         
-        self.results = {
-            'order_sizes': [],
-            'processing_times': [],
-            'memory_usage': [],
-            'accuracy': []
-        }
+        self.results = np.empty(0, dtype=RESULT_DTYPE)
     
     def run_order_book_benchmark(self, sizes=[100, 1000, 10000, 100000]):
         print("Running Order Book Processing Benchmark...")
-        for size in sizes:
-            # Simulate order book processing
-            start_time = time.time()
-            # Simulate processing with artificial delay based on size
-            time.sleep(size/100000)  # Simulated processing time
-            processing_time = (time.time() - start_time) * 1000  # Convert to ms
+        rng = np.random.default_rng()
+        results = np.empty(len(sizes), dtype=RESULT_DTYPE)
+        results['order_size'] = sizes
+        results['memory_usage'] = results['order_size'] * 0.024  # Simulated memory usage
+        results['accuracy'] = rng.uniform(0.8, 0.95, size=len(sizes))
+        
+        best_price = 50000.0
+        for i, size in enumerate(sizes):
+            # Synthetic ask side: prices rising 1% across the book, random level sizes
+            prices = np.linspace(best_price, best_price * 1.01, size)
+            qtys = rng.exponential(1.0, size)
             
-            self.results['order_sizes'].append(size)
-            self.results['processing_times'].append(processing_time)
-            self.results['memory_usage'].append(size * 0.024)  # Simulated memory usage
-            self.results['accuracy'].append(np.random.uniform(0.8, 0.95))
+            # Walk the book: average fill price after each level, minus the touch price
+            start_time = time.perf_counter()
+            slippage = np.cumsum(prices * qtys) / np.cumsum(qtys) - best_price
+            results['processing_time'][i] = (time.perf_counter() - start_time) * 1000  # Convert to ms
+            results['slippage'][i] = slippage[-1]  # Slippage for filling the whole book
+        
+        self.results = results
     
     def generate_visualizations(self):
-        # Set style
-        plt.style.use('seaborn')
+        # Plotting libraries are only loaded when a report is actually drawn
+        import pandas as pd
+        import seaborn as sns
+        plt = _pyplot()
         
-        # Processing Time vs Order Size
-        plt.figure(figsize=(10, 6))
-        plt.plot(self.results['order_sizes'], self.results['processing_times'], 'o-')
-        plt.title('Processing Time vs Order Size')
-        plt.xlabel('Order Size (USD)')
-        plt.ylabel('Processing Time (ms)')
-        plt.xscale('log')
-        plt.grid(True)
-        plt.savefig(f"{self.output_dir}/processing_time.png")
-        plt.close()
+        # (file name, result field, title, y label) for each line plot
+        plots = [
+            ('processing_time', 'processing_time', 'Processing Time vs Order Size', 'Processing Time (ms)'),
+            ('memory_usage', 'memory_usage', 'Memory Usage vs Order Size', 'Memory Usage (KB)'),
+            ('accuracy', 'accuracy', 'Model Accuracy vs Order Size', 'Accuracy (R²)')
+        ]
         
-        # Memory Usage vs Order Size
-        plt.figure(figsize=(10, 6))
-        plt.plot(self.results['order_sizes'], self.results['memory_usage'], 'o-')
-        plt.title('Memory Usage vs Order Size')
-        plt.xlabel('Order Size (USD)')
-        plt.ylabel('Memory Usage (KB)')
-        plt.xscale('log')
-        plt.grid(True)
-        plt.savefig(f"{self.output_dir}/memory_usage.png")
-        plt.close()
-        
-        # Accuracy vs Order Size
-        plt.figure(figsize=(10, 6))
-        plt.plot(self.results['order_sizes'], self.results['accuracy'], 'o-')
-        plt.title('Model Accuracy vs Order Size')
-        plt.xlabel('Order Size (USD)')
-        plt.ylabel('Accuracy (R²)')
-        plt.xscale('log')
-        plt.grid(True)
-        plt.savefig(f"{self.output_dir}/accuracy.png")
-        plt.close()
+        # Reuse one figure for all line plots
+        fig, ax = plt.subplots(figsize=(10, 6))
+        for name, field, title, ylabel in plots:
+            ax.clear()
+            ax.plot(self.results['order_size'], self.results[field], 'o-')
+            ax.set(title=title, xlabel='Order Size (USD)', ylabel=ylabel, xscale='log')
+            ax.grid(True)
+            fig.savefig(f"{self.output_dir}/{name}.png")
+        plt.close(fig)
         
         # Heatmap of correlations
         df = pd.DataFrame(self.results)
@@ -85,19 +90,23 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 ## Order Processing Performance
 
 ### Processing Time Analysis
-- Minimum Processing Time: {min(self.results['processing_times']):.2f} ms
-- Maximum Processing Time: {max(self.results['processing_times']):.2f} ms
-- Average Processing Time: {np.mean(self.results['processing_times']):.2f} ms
+- Minimum Processing Time: {self.results['processing_time'].min():.2f} ms
+- Maximum Processing Time: {self.results['processing_time'].max():.2f} ms
+- Average Processing Time: {self.results['processing_time'].mean():.2f} ms
+
+### Book Walk Slippage
+- Minimum Slippage: {self.results['slippage'].min():.2f} USD
+- Maximum Slippage: {self.results['slippage'].max():.2f} USD
 
 ### Memory Usage Analysis
-- Minimum Memory Usage: {min(self.results['memory_usage']):.2f} KB
-- Maximum Memory Usage: {max(self.results['memory_usage']):.2f} KB
-- Average Memory Usage: {np.mean(self.results['memory_usage']):.2f} KB
+- Minimum Memory Usage: {self.results['memory_usage'].min():.2f} KB
+- Maximum Memory Usage: {self.results['memory_usage'].max():.2f} KB
+- Average Memory Usage: {self.results['memory_usage'].mean():.2f} KB
 
 ### Model Accuracy
-- Minimum Accuracy: {min(self.results['accuracy']):.2f}
-- Maximum Accuracy: {max(self.results['accuracy']):.2f}
-- Average Accuracy: {np.mean(self.results['accuracy']):.2f}
+- Minimum Accuracy: {self.results['accuracy'].min():.2f}
+- Maximum Accuracy: {self.results['accuracy'].max():.2f}
+- Average Accuracy: {self.results['accuracy'].mean():.2f}
 
 ## Visualizations
 ![Processing Time](processing_time.png)
@@ -106,7 +115,7 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 ![Correlation Matrix](correlation_matrix.png)
 
 ## Performance Characteristics
-1. Processing Time scales {np.polyfit(np.log10(self.results['order_sizes']), self.results['processing_times'], 1)[0]:.2f}x with log(order size)
+1. Processing Time scales {np.polyfit(np.log10(self.results['order_size']), self.results['processing_time'], 1)[0]:.2f}x with log(order size)
 2. Memory Usage scales linearly with order size
 3. Accuracy shows slight degradation with larger orders
 
@@ -1,15 +1,18 @@
 import psutil
 import time
-import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime
 import os
 import sys
 import threading
-from collections import deque
 import logging
 import platform
 
+SAMPLE_INTERVAL = 0.1  # Seconds between samples
+
+# Kernel clock ticks per second, for the /proc thread CPU counters
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
 class EnhancedPerformanceCollector:
     def __init__(self, target_pid=None, duration=60):
         self.duration = duration
@@ -17,21 +20,29 @@ class EnhancedPerformanceCollector:
         self.output_dir = "docs/performance_data"
         self.is_windows = platform.system() == 'Windows'
         
+        # Samples are written by index into preallocated buffers (one slot per 100ms tick)
+        self._cap = int(self.duration / SAMPLE_INTERVAL) + 16
+        self.n_samples = 0
+        
         # Basic metrics
-        self.timestamps = []
-        self.cpu_usage = []
-        self.memory_usage = []
+        self.timestamps = np.zeros(self._cap, dtype='i4')  # ms since start
+        self.cpu_usage = np.zeros(self._cap, dtype='u2')  # half-percent steps
+        self.memory_usage = np.zeros(self._cap, dtype='i4')  # KB
         
-        # Thread metrics
+        # Thread metrics: thread id -> [first CPU seconds, first time,
+        # last CPU seconds, last time, smoothed recent CPU %]
         self.thread_usage = {}
+        self._task_dir = None  # /proc/<pid>/task when thread stats can be read directly
         
         # System-wide network metrics (for Windows compatibility)
-        self.network_usage = []
-        self.bandwidth_usage = []
+        self.network_usage = np.zeros(self._cap, dtype='i4')  # KB per sample
+        self.bandwidth_usage = np.zeros(self._cap, dtype='f4')  # KB/s
         
         # Storage metrics
-        self.disk_read_bytes = []
-        self.disk_write_bytes = []
+        # Cumulative byte counters stay float64 so large totals keep KB precision
+        self.disk_read_bytes = np.zeros(self._cap, dtype='f8')
+        self.disk_write_bytes = np.zeros(self._cap, dtype='f8')
+        self._last_net = None  # (time, total bytes) at the previous network sample
         
         # Create output directory
         if not os.path.exists(self.output_dir):
@@ -44,69 +55,135 @@ class EnhancedPerformanceCollector:
             format='%(asctime)s - %(levelname)s - %(message)s'
         )
     
-    def collect_basic_metrics(self, process):
+    def collect_basic_metrics(self, info):
         """Collect CPU and memory metrics"""
-        try:
-            self.timestamps.append(time.time() - self.start_time)
-            self.cpu_usage.append(process.cpu_percent())
-            self.memory_usage.append(process.memory_info().rss / 1024 / 1024)  # MB
-        except Exception as e:
-            logging.error(f"Error collecting basic metrics: {str(e)}")
+        i = self.n_samples
+        self.timestamps[i] = int((time.monotonic() - self.start_time) * 1000)
+        self.cpu_usage[i] = int(info['cpu_percent'] * 2)
+        self.memory_usage[i] = info['memory_info'].rss >> 10
         
-    def collect_thread_metrics(self, process):
+    def collect_thread_metrics(self, info):
         """Collect thread-specific metrics"""
+        now = time.monotonic()
+        if self._task_dir is not None:
+            self._collect_proc_threads(now)
+            return
+        # None when psutil was denied access to the thread list
+        for thread in info['threads'] or ():
+            self._update_thread(thread.id, thread.system_time + thread.user_time, now)
+    
+    def _collect_proc_threads(self, now):
+        """Read per-thread CPU ticks straight from /proc/<pid>/task (Linux)"""
+        task_dir = self._task_dir
         try:
-            threads = process.threads()
-            for thread in threads:
-                if thread.id not in self.thread_usage:
-                    self.thread_usage[thread.id] = []
-                self.thread_usage[thread.id].append(thread.system_time + thread.user_time)
-        except Exception as e:
-            logging.error(f"Error collecting thread metrics: {str(e)}")
+            tids = os.listdir(task_dir)
+        except FileNotFoundError:
+            return  # Process exited; the next as_dict call reports it
+        
+        for tid in tids:
+            try:
+                with open(f"{task_dir}/{tid}/stat", 'rb') as f:
+                    stat = f.read()
+            except (FileNotFoundError, ProcessLookupError, PermissionError):
+                continue  # Thread exited between listing and reading, or is unreadable
+            
+            # The command name may contain spaces, so split after its closing paren;
+            # utime and stime are fields 14 and 15 of the stat line
+            fields = stat[stat.rindex(b')') + 2:].split()
+            self._update_thread(int(tid), (int(fields[11]) + int(fields[12])) / CLOCK_TICKS, now)
+    
+    def _update_thread(self, thread_id, cpu_time, now):
+        """Record a thread's cumulative CPU time read at monotonic time `now`"""
+        usage = self.thread_usage.get(thread_id)
+        if usage is None:
+            self.thread_usage[thread_id] = [cpu_time, now, cpu_time, now, 0.0]
+            return
+        
+        # Utilisation over the time actually elapsed since this thread's last
+        # reading (skipped or late ticks make it longer than SAMPLE_INTERVAL)
+        elapsed = now - usage[3]
+        if elapsed <= 0:
+            return
+        util = (cpu_time - usage[2]) / elapsed * 100
+        usage[2] = cpu_time
+        usage[3] = now
+        usage[4] = 0.9 * usage[4] + 0.1 * util
     
     def collect_network_metrics(self):
         """Collect system-wide network metrics (Windows compatible)"""
-        try:
-            net_io = psutil.net_io_counters()
-            self.network_usage.append((net_io.bytes_sent + net_io.bytes_recv) / 1024)  # KB
-            self.bandwidth_usage.append(net_io.bytes_sent / 1024)  # KB/s
-        except Exception as e:
-            logging.error(f"Error collecting network metrics: {str(e)}")
+        net_io = psutil.net_io_counters()
+        now = time.monotonic()
+        total = net_io.bytes_sent + net_io.bytes_recv
+        
+        # Counters are cumulative, so report the change since the previous sample
+        if self._last_net is not None:
+            last_time, last_total = self._last_net
+            i = self.n_samples
+            transferred = (total - last_total) >> 10  # KB
+            self.network_usage[i] = transferred
+            if now > last_time:
+                self.bandwidth_usage[i] = transferred / (now - last_time)  # KB/s
+        self._last_net = (now, total)
     
-    def collect_storage_metrics(self, process):
+    def collect_storage_metrics(self, info):
         """Collect disk I/O metrics"""
-        try:
-            if hasattr(process, 'io_counters'):
-                io_counters = process.io_counters()
-                self.disk_read_bytes.append(io_counters.read_bytes / 1024)  # KB
-                self.disk_write_bytes.append(io_counters.write_bytes / 1024)  # KB
-            else:
-                # Use system-wide disk I/O as fallback
-                disk_io = psutil.disk_io_counters()
-                self.disk_read_bytes.append(disk_io.read_bytes / 1024)  # KB
-                self.disk_write_bytes.append(disk_io.write_bytes / 1024)  # KB
-        except Exception as e:
-            logging.error(f"Error collecting storage metrics: {str(e)}")
+        i = self.n_samples
+        io_counters = info.get('io_counters')
+        if io_counters is not None:
+            self.disk_read_bytes[i] = io_counters.read_bytes / 1024  # KB
+            self.disk_write_bytes[i] = io_counters.write_bytes / 1024  # KB
+        else:
+            # Use system-wide disk I/O as fallback
+            disk_io = psutil.disk_io_counters()
+            self.disk_read_bytes[i] = disk_io.read_bytes / 1024  # KB
+            self.disk_write_bytes[i] = disk_io.write_bytes / 1024  # KB
     
     def collect_metrics(self):
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         try:
             process = psutil.Process(self.target_pid) if self.target_pid else psutil.Process()
             logging.info(f"Monitoring process with PID: {process.pid}")
             
-            while time.time() - self.start_time < self.duration:
+            # Read all per-process attributes in one batched call per tick;
+            # as_dict runs inside process.oneshot(), so the attributes share
+            # a single cached /proc/<pid>/stat read
+            attrs = ['cpu_percent', 'memory_info']
+            if hasattr(process, 'io_counters'):
+                attrs.append('io_counters')
+            
+            # On Linux, thread times come from /proc without psutil's per-thread tuples
+            task_dir = f"/proc/{process.pid}/task"
+            if os.path.isdir(task_dir):
+                self._task_dir = task_dir
+            else:
+                attrs.append('threads')
+            
+            # Samples land on a fixed 100ms grid; sleeping to absolute deadlines
+            # keeps collection time from stretching the interval
+            next_t = time.monotonic()
+            end = next_t + self.duration
+            while next_t < end and self.n_samples < self._cap:
+                next_t += SAMPLE_INTERVAL
                 try:
-                    self.collect_basic_metrics(process)
-                    self.collect_thread_metrics(process)
-                    self.collect_network_metrics()  # System-wide network metrics
-                    self.collect_storage_metrics(process)
-                    time.sleep(0.1)  # Sample every 100ms
-                    
+                    # Attributes we may not read (AccessDenied/ZombieProcess) come back as None
+                    info = process.as_dict(attrs=attrs, ad_value=None)
                 except psutil.NoSuchProcess:
                     logging.error(f"Process {self.target_pid} has terminated.")
                     break
-                except Exception as e:
-                    logging.error(f"Error collecting metrics: {str(e)}")
+                
+                if info['cpu_percent'] is None or info['memory_info'] is None:
+                    # Skip the tick rather than record made-up numbers
+                    logging.error(f"Access denied reading process {process.pid}, skipping sample")
+                else:
+                    self.collect_basic_metrics(info)
+                    self.collect_thread_metrics(info)
+                    self.collect_network_metrics()  # System-wide network metrics
+                    self.collect_storage_metrics(info)
+                    self.n_samples += 1
+                
+                delay = next_t - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
                     
         except psutil.NoSuchProcess:
             logging.error(f"Process with PID {self.target_pid} not found!")
@@ -114,26 +191,33 @@ class EnhancedPerformanceCollector:
     
     def calculate_statistics(self):
         """Calculate various statistics from collected data"""
+        n = self.n_samples
+        cpu = self.cpu_usage[:n]
+        memory = self.memory_usage[:n]  # KB
+        bandwidth = self.bandwidth_usage[:n]
+        disk_read = self.disk_read_bytes[:n]
+        disk_write = self.disk_write_bytes[:n]
+        
         stats = {
             "cpu": {
-                "average": np.mean(self.cpu_usage) if self.cpu_usage else 0,
-                "peak": np.max(self.cpu_usage) if self.cpu_usage else 0,
-                "pattern": "Stable" if self.cpu_usage and np.std(self.cpu_usage) < 5 else "Variable"
+                "average": np.mean(cpu) / 2 if n else 0,
+                "peak": np.max(cpu) / 2 if n else 0,
+                "pattern": "Stable" if n and np.std(cpu) < 10 else "Variable"
             },
             "memory": {
-                "average": np.mean(self.memory_usage) if self.memory_usage else 0,
-                "peak": np.max(self.memory_usage) if self.memory_usage else 0,
-                "growth_rate": (self.memory_usage[-1] - self.memory_usage[0])/self.duration if self.memory_usage else 0
+                "average": np.mean(memory) if n else 0,
+                "peak": np.max(memory) if n else 0,
+                "growth_rate": int(memory[-1] - memory[0])/self.duration if n else 0
             },
             "network": {
-                "average_bandwidth": np.mean(self.bandwidth_usage) if self.bandwidth_usage else 0,
-                "peak_bandwidth": np.max(self.bandwidth_usage) if self.bandwidth_usage else 0,
-                "total_transfer": np.sum(self.network_usage) if self.network_usage else 0
+                "average_bandwidth": np.mean(bandwidth) if n else 0,
+                "peak_bandwidth": np.max(bandwidth) if n else 0,
+                "total_transfer": self.network_usage[:n].sum(dtype=np.int64) if n else 0
             },
             "storage": {
-                "total_read": (self.disk_read_bytes[-1] - self.disk_read_bytes[0])/1024 if self.disk_read_bytes else 0,
-                "total_write": (self.disk_write_bytes[-1] - self.disk_write_bytes[0])/1024 if self.disk_write_bytes else 0
-            } if self.disk_read_bytes and self.disk_write_bytes else {"total_read": 0, "total_write": 0}
+                "total_read": (disk_read[-1] - disk_read[0])/1024,
+                "total_write": (disk_write[-1] - disk_write[0])/1024
+            } if n else {"total_read": 0, "total_write": 0}
         }
         return stats
     
@@ -151,9 +235,9 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 - Thread Count: {len(self.thread_usage)}
 
 ### 2. Memory Usage
-- Average Memory Usage: {stats['memory']['average']:.2f} MB
-- Peak Memory Usage: {stats['memory']['peak']:.2f} MB
-- Memory Growth Rate: {stats['memory']['growth_rate']:.2f} MB/s
+- Average Memory Usage: {stats['memory']['average']/1024:.2f} MB
+- Peak Memory Usage: {stats['memory']['peak']/1024:.2f} MB
+- Memory Growth Rate: {stats['memory']['growth_rate']/1024:.2f} MB/s
 
 ### 3. Network Performance (System-wide)
 - Average Bandwidth: {stats['network']['average_bandwidth']:.2f} KB/s
@@ -167,8 +251,10 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 ## Thread Analysis
 """
         # Add thread-specific information
-        for thread_id, usage in self.thread_usage.items():
-            report += f"- Thread {thread_id}: {np.mean(usage):.2f}% average CPU\n"
+        for thread_id, (first_cpu, first_t, last_cpu, last_t, recent_cpu) in self.thread_usage.items():
+            # Average over the span this thread was observed; recent is the moving average at its last reading
+            avg_cpu = (last_cpu - first_cpu) / (last_t - first_t) * 100 if last_t > first_t else 0.0
+            report += f"- Thread {thread_id}: {avg_cpu:.2f}% average CPU ({recent_cpu:.2f}% recent)\n"
         
         report += "\n## Performance Visualizations\n"
         report += "![CPU Usage](cpu_usage.png)\n"
@@ -179,38 +265,32 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             f.write(report)
     
     def generate_plots(self):
-        # CPU Usage Plot
-        if self.cpu_usage:
-            plt.figure(figsize=(10, 6))
-            plt.plot(self.timestamps, self.cpu_usage)
-            plt.title('CPU Usage Over Time')
-            plt.xlabel('Time (seconds)')
-            plt.ylabel('CPU Usage (%)')
-            plt.grid(True)
-            plt.savefig(f"{self.output_dir}/cpu_usage.png")
-            plt.close()
-        
-        # Memory Usage Plot
-        if self.memory_usage:
-            plt.figure(figsize=(10, 6))
-            plt.plot(self.timestamps, self.memory_usage)
-            plt.title('Memory Usage Over Time')
-            plt.xlabel('Time (seconds)')
-            plt.ylabel('Memory Usage (MB)')
-            plt.grid(True)
-            plt.savefig(f"{self.output_dir}/memory_usage.png")
-            plt.close()
-        
-        # Network Usage Plot
-        if self.bandwidth_usage:
-            plt.figure(figsize=(10, 6))
-            plt.plot(self.timestamps, self.bandwidth_usage)
-            plt.title('Network Bandwidth Usage Over Time')
-            plt.xlabel('Time (seconds)')
-            plt.ylabel('Bandwidth (KB/s)')
-            plt.grid(True)
-            plt.savefig(f"{self.output_dir}/network_usage.png")
-            plt.close()
+        n = self.n_samples
+        if not n:
+            return
+        timestamps = self.timestamps[:n] / 1000  # seconds
+        
+        # Deferred so sampling runs never pay the plotting import cost
+        import matplotlib
+        matplotlib.use('Agg')  # File output only, no GUI canvas
+        import matplotlib.pyplot as plt
+        
+        # (file name, series, title, y label) for each plot
+        plots = [
+            ('cpu_usage', self.cpu_usage[:n] / 2, 'CPU Usage Over Time', 'CPU Usage (%)'),
+            ('memory_usage', self.memory_usage[:n] / 1024, 'Memory Usage Over Time', 'Memory Usage (MB)'),
+            ('network_usage', self.bandwidth_usage[:n], 'Network Bandwidth Usage Over Time', 'Bandwidth (KB/s)')
+        ]
+        
+        # Reuse one figure for every plot
+        fig, ax = plt.subplots(figsize=(10, 6))
+        for name, series, title, ylabel in plots:
+            ax.clear()
+            ax.plot(timestamps, series)
+            ax.set(title=title, xlabel='Time (seconds)', ylabel=ylabel)
+            ax.grid(True)
+            fig.savefig(f"{self.output_dir}/{name}.png")
+        plt.close(fig)
 
 def main():
     target_pid = int(sys.argv[1]) if len(sys.argv) > 1 else None
@@ -220,7 +300,7 @@ def main():
     print(f"Starting enhanced performance data collection{f' for PID {target_pid}' if target_pid else ''}...")
     collector.collect_metrics()
     
-    if collector.timestamps:  # Only generate reports if we collected data
+    if collector.n_samples:  # Only generate reports if we collected data
         print("Generating performance plots...")
         collector.generate_plots()
         print("Generating enhanced performance report...")
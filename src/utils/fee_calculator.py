@@ -1,84 +1,106 @@
-from typing import Dict
+from enum import IntEnum
+from typing import Dict, NamedTuple
 import logging
+import numpy as np
+from src.utils._metrics_kernel import compute_fees
 
 logger = logging.getLogger(__name__)
 
+class FeeTier(IntEnum):
+    """OKX VIP fee tiers, usable as row indices into FEE_TABLE"""
+    VIP0 = 0
+    VIP1 = 1
+    VIP2 = 2
+    VIP3 = 3
+    VIP4 = 4
+    VIP5 = 5
+
+# Display names, same order as FeeTier
+TIER_NAMES = (
+    "VIP 0 (0.10%)",
+    "VIP 1 (0.08%)",
+    "VIP 2 (0.07%)",
+    "VIP 3 (0.06%)",
+    "VIP 4 (0.05%)",
+    "VIP 5 (0.04%)"
+)
+
+# (maker fee, taker fee) per tier
+FEE_TABLE = np.array([
+    [0.0008, 0.0010],
+    [0.0006, 0.0008],
+    [0.0005, 0.0007],
+    [0.0004, 0.0006],
+    [0.0003, 0.0005],
+    [0.0002, 0.0004]
+], dtype=np.float64)
+
+class FeeResult(NamedTuple):
+    """Fee amounts in USD plus the rates they were computed from"""
+    maker_fee: float
+    taker_fee: float
+    expected_fee: float
+    expected_fee_bps: float
+    maker_fee_rate: float
+    taker_fee_rate: float
+
 class FeeCalculator:
-    def __init__(self):
-        # OKX fee tiers (maker/taker fees)
-        self.fee_tiers = {
-            "VIP 0 (0.10%)": (0.0008, 0.0010),
-            "VIP 1 (0.08%)": (0.0006, 0.0008),
-            "VIP 2 (0.07%)": (0.0005, 0.0007),
-            "VIP 3 (0.06%)": (0.0004, 0.0006),
-            "VIP 4 (0.05%)": (0.0003, 0.0005),
-            "VIP 5 (0.04%)": (0.0002, 0.0004)
-        }
-    
     def calculate_fees(self,
                       order_value: float,
-                      fee_tier: str,
-                      maker_probability: float) -> Dict[str, float]:
+                      fee_tier: int,
+                      maker_probability: float) -> FeeResult:
         """
         Calculate expected trading fees
         
         Args:
             order_value: Total value of the order in USD
-            fee_tier: Selected fee tier (VIP level)
+            fee_tier: Selected fee tier (FeeTier or index into TIER_NAMES)
             maker_probability: Probability of order being maker
         
         Returns:
-            Dictionary containing fee calculations
+            FeeResult with the fee calculations
+        """
+        maker_fee, taker_fee = FEE_TABLE[fee_tier]
+        
+        return FeeResult(
+            *compute_fees(order_value, maker_fee, taker_fee, maker_probability),
+            maker_fee,
+            taker_fee
+        )
+    
+    def calculate_fees_batch(self,
+                             order_values: np.ndarray,
+                             tier_idx: int,
+                             maker_probs: np.ndarray) -> Dict[str, np.ndarray]:
         """
-        try:
-            # Get maker/taker fees for the tier
-            maker_fee, taker_fee = self.fee_tiers.get(
-                fee_tier,
-                self.fee_tiers["VIP 0 (0.10%)"]  # Default to VIP 0
-            )
-            
-            # Calculate expected fee based on maker probability
-            taker_probability = 1 - maker_probability
-            expected_fee_rate = (
-                maker_fee * maker_probability +
-                taker_fee * taker_probability
-            )
-            
-            # Calculate fees
-            maker_fee_amount = order_value * maker_fee
-            taker_fee_amount = order_value * taker_fee
-            expected_fee_amount = order_value * expected_fee_rate
-            
-            # Convert to basis points
-            expected_fee_bps = expected_fee_rate * 10000
-            
-            return {
-                'maker_fee': maker_fee_amount,
-                'taker_fee': taker_fee_amount,
-                'expected_fee': expected_fee_amount,
-                'expected_fee_bps': expected_fee_bps,
-                'maker_fee_rate': maker_fee,
-                'taker_fee_rate': taker_fee
-            }
-            
-        except Exception as e:
-            logger.error(f"Error calculating fees: {str(e)}")
-            return {
-                'maker_fee': 0.0,
-                'taker_fee': 0.0,
-                'expected_fee': 0.0,
-                'expected_fee_bps': 0.0,
-                'maker_fee_rate': 0.0,
-                'taker_fee_rate': 0.0
-            }
+        Calculate expected trading fees for many orders in one tier
+        
+        Args:
+            order_values: Order values in USD
+            tier_idx: Selected fee tier (FeeTier or index into TIER_NAMES)
+            maker_probs: Probability of each order being maker
+        
+        Returns:
+            Dictionary of fee arrays, one entry per order
+        """
+        maker_fee, taker_fee = FEE_TABLE[tier_idx]
+        order_values = np.asarray(order_values, dtype=np.float64)
+        maker_probs = np.asarray(maker_probs, dtype=np.float64)
+        
+        # Blended rate per order
+        expected_rate = maker_fee * maker_probs + taker_fee * (1 - maker_probs)
+        
+        return {
+            'maker_fee': order_values * maker_fee,
+            'taker_fee': order_values * taker_fee,
+            'expected_fee': order_values * expected_rate,
+            'expected_fee_bps': expected_rate * 10000  # Convert to basis points
+        }
     
     def get_fee_tiers(self) -> Dict[str, tuple]:
         """Return available fee tiers"""
-        return self.fee_tiers.copy()
+        return {name: tuple(rates) for name, rates in zip(TIER_NAMES, FEE_TABLE.tolist())}
     
-    def get_tier_rates(self, tier: str) -> tuple:
+    def get_tier_rates(self, tier: int) -> tuple:
         """Get maker/taker rates for a specific tier"""
-        return self.fee_tiers.get(
-            tier,
-            self.fee_tiers["VIP 0 (0.10%)"]
-        ) 
\ No newline at end of file
+        return tuple(FEE_TABLE[tier].tolist())
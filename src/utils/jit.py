@@ -0,0 +1,16 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.info("Numba not installed, numeric kernels will run as plain Python")
+    
+    def njit(*args, **kwargs):
+        """Fallback for numba.njit that returns the function unchanged"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
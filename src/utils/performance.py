@@ -2,77 +2,129 @@ import time
 import logging
 from collections import deque
 from typing import Dict, Optional
-from datetime import datetime, timedelta
 import numpy as np
+from src.utils.jit import njit
 
 logger = logging.getLogger(__name__)
 
+# Latency channels, as columns of PerformanceMonitor.latencies
+WS_LATENCY, PROCESSING_LATENCY, UI_LATENCY = 0, 1, 2
+
+@njit(cache=True)
+def _ring_push(buf, head, count, value):
+    """
+    Write value into a ring buffer, evicting the oldest entry once it is full
+    
+    Returns:
+        Tuple of (new head, new count, change in the buffer's sum)
+    """
+    size = buf.shape[0]
+    evicted = float(buf[head]) if count == size else 0.0
+    buf[head] = value
+    # Sum what was stored, so evictions cancel exactly
+    return (head + 1) % size, min(count + 1, size), float(buf[head]) - evicted
+
+# Compile at import for both the contiguous and the column-view buffers
+_ring_push(np.zeros(2, dtype=np.float32), 0, 0, 1.0)
+_ring_push(np.zeros((2, 3), dtype=np.float32)[:, 0], 0, 0, 1.0)
+
 class PerformanceMonitor:
     def __init__(self, window_size: int = 1000):
         self.window_size = window_size
         
-        # Latency tracking
-        self.websocket_latencies = deque(maxlen=window_size)
-        self.processing_latencies = deque(maxlen=window_size)
-        self.ui_update_latencies = deque(maxlen=window_size)
+        # Latency tracking: one float32 ring buffer per column, sharing a single
+        # (window, 3) array; running sums make the means O(1) per poll
+        self.latencies = np.zeros((window_size, 3), dtype=np.float32)
+        self._lat_head = [0, 0, 0]   # Next row to write, per channel
+        self._lat_count = [0, 0, 0]  # Valid samples, per channel
+        self._lat_sum = [0.0, 0.0, 0.0]
+        self._lat_cols = [self.latencies[:, c] for c in range(3)]  # Views, built once
         
-        # Tick tracking
-        self.tick_times = deque(maxlen=window_size)
-        self.tick_rates = deque(maxlen=window_size)
+        # Tick tracking: arrival time of the last tick and a ring buffer of rates
+        self._last_tick_ns = 0
+        self.tick_rates = np.zeros(window_size, dtype=np.float32)
+        self._rate_head = 0
+        self._rate_count = 0
+        self._rate_sum = 0.0
+        self._last_rate = 0.0
         
         # Memory tracking
         self.memory_usage = deque(maxlen=window_size)
         
-        self.start_time = datetime.now()
+        self._start_ns = time.monotonic_ns()
+        
+        # Bumped by every record_*; get_metrics reuses its last result until it changes
+        self._version = 0
+        self._cached_version = -1
+        self._cached_metrics = None
     
     def record_websocket_latency(self, latency_ms: float):
         """Record WebSocket message latency"""
-        self.websocket_latencies.append(latency_ms)
+        self._record_latency(WS_LATENCY, latency_ms)
     
     def record_processing_latency(self, latency_ms: float):
         """Record processing latency"""
-        self.processing_latencies.append(latency_ms)
+        self._record_latency(PROCESSING_LATENCY, latency_ms)
     
     def record_ui_latency(self, latency_ms: float):
         """Record UI update latency"""
-        self.ui_update_latencies.append(latency_ms)
+        self._record_latency(UI_LATENCY, latency_ms)
+    
+    def _record_latency(self, channel: int, latency_ms: float):
+        """Write a latency into its column, evicting the oldest once the window is full"""
+        self._lat_head[channel], self._lat_count[channel], delta = _ring_push(
+            self._lat_cols[channel], self._lat_head[channel], self._lat_count[channel], latency_ms
+        )
+        self._lat_sum[channel] += delta
+        self._version += 1
     
     def record_tick(self):
         """Record a tick arrival"""
-        now = datetime.now()
-        self.tick_times.append(now)
+        now = time.monotonic_ns()
+        last = self._last_tick_ns
+        self._last_tick_ns = now
         
-        # Calculate tick rate if we have enough data
-        if len(self.tick_times) > 1:
-            time_diff = (self.tick_times[-1] - self.tick_times[-2]).total_seconds()
-            if time_diff > 0:
-                rate = 1.0 / time_diff
-                self.tick_rates.append(rate)
+        # Calculate tick rate if we have a previous tick
+        if last and now > last:
+            rate = 1e9 / (now - last)
+            self._rate_head, self._rate_count, delta = _ring_push(
+                self.tick_rates, self._rate_head, self._rate_count, rate
+            )
+            self._rate_sum += delta
+            self._last_rate = rate
+            self._version += 1
     
     def record_memory(self, usage_mb: float):
         """Record memory usage"""
         self.memory_usage.append(usage_mb)
+        self._version += 1
     
     def get_metrics(self) -> Dict[str, float]:
         """Get current performance metrics"""
+        # Nothing recorded since the last call: only the uptime has moved
+        if self._version == self._cached_version:
+            self._cached_metrics['uptime_seconds'] = (time.monotonic_ns() - self._start_ns) * 1e-9
+            return self._cached_metrics
+        
         try:
             # Calculate latency statistics
-            ws_latency = np.mean(self.websocket_latencies) if self.websocket_latencies else 0
-            proc_latency = np.mean(self.processing_latencies) if self.processing_latencies else 0
-            ui_latency = np.mean(self.ui_update_latencies) if self.ui_update_latencies else 0
+            ws_latency, proc_latency, ui_latency = (
+                total / count if count else 0.0
+                for total, count in zip(self._lat_sum, self._lat_count)
+            )
             
             # Calculate tick rate statistics
-            current_rate = self.tick_rates[-1] if self.tick_rates else 0
-            avg_rate = np.mean(self.tick_rates) if self.tick_rates else 0
+            current_rate = self._last_rate
+            avg_rate = self._rate_sum / self._rate_count if self._rate_count else 0.0
             
             # Calculate memory statistics
             current_memory = self.memory_usage[-1] if self.memory_usage else 0
             avg_memory = np.mean(self.memory_usage) if self.memory_usage else 0
             
             # Calculate uptime
-            uptime = (datetime.now() - self.start_time).total_seconds()
+            uptime = (time.monotonic_ns() - self._start_ns) * 1e-9
             
-            return {
+            self._cached_metrics = {
                 'websocket_latency_ms': ws_latency,
                 'processing_latency_ms': proc_latency,
                 'ui_latency_ms': ui_latency,
@@ -83,6 +135,8 @@ class PerformanceMonitor:
                 'average_memory_mb': avg_memory,
                 'uptime_seconds': uptime
             }
+            self._cached_version = self._version
+            return self._cached_metrics
             
         except Exception as e:
             logger.error(f"Error calculating performance metrics: {str(e)}")
@@ -101,17 +155,18 @@ class PerformanceMonitor:
     def get_latency_percentiles(self) -> Dict[str, float]:
         """Calculate latency percentiles"""
         try:
-            total_latencies = [w + p + u for w, p, u in zip(
-                self.websocket_latencies,
-                self.processing_latencies,
-                self.ui_update_latencies
-            )]
+            n = min(self._lat_count)
             
-            if total_latencies:
+            if n:
+                # Gather the newest n rows of each column, then sum across channels
+                rows = (np.array(self._lat_head) - n + np.arange(n)[:, None]) % self.window_size
+                total_latencies = np.take_along_axis(self.latencies, rows, axis=0).sum(axis=1)
+                # A single sort serves all three ranks
+                p50, p90, p99 = np.percentile(total_latencies, [50, 90, 99])
                 return {
-                    'p50_latency_ms': np.percentile(total_latencies, 50),
-                    'p90_latency_ms': np.percentile(total_latencies, 90),
-                    'p99_latency_ms': np.percentile(total_latencies, 99)
+                    'p50_latency_ms': p50,
+                    'p90_latency_ms': p90,
+                    'p99_latency_ms': p99
                 }
             
             return {
@@ -130,11 +185,15 @@ class PerformanceMonitor:
     
     def reset(self):
         """Reset all metrics"""
-        self.websocket_latencies.clear()
-        self.processing_latencies.clear()
-        self.ui_update_latencies.clear()
-        self.tick_times.clear()
-        self.tick_rates.clear()
+        self._lat_head = [0, 0, 0]
+        self._lat_count = [0, 0, 0]
+        self._lat_sum = [0.0, 0.0, 0.0]
+        self._last_tick_ns = 0
+        self._rate_head = 0
+        self._rate_count = 0
+        self._rate_sum = 0.0
+        self._last_rate = 0.0
         self.memory_usage.clear()
-        self.start_time = datetime.now()
+        self._start_ns = time.monotonic_ns()
+        self._version += 1
         logger.info("Performance metrics reset") 
\ No newline at end of file
@@ -1,18 +1,74 @@
 import psutil
 import time
+import math
+import matplotlib
+matplotlib.use('Agg')  # File output only, no GUI canvas
 import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime
 import os
 import sys
 
+def _decimate(x, y, bins=800):
+    """
+    Min/max decimation for plotting: each of `bins` equal slices of the series
+    becomes two points (its minimum and maximum), so spikes stay visible
+    """
+    if len(x) <= bins:
+        return x, y
+    starts = np.linspace(0, len(x), bins + 1, dtype=int)[:-1]
+    xs = np.repeat(x[starts], 2)
+    ys = np.stack((np.minimum.reduceat(y, starts), np.maximum.reduceat(y, starts))).ravel('F')
+    return xs, ys
+
+class _ProcStatReader:
+    """Reads CPU% and RSS for one process straight from /proc (Linux only)"""
+    CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+    
+    def __init__(self, pid):
+        # Kept open and re-read with pread, so each sample is one syscall per file
+        self._stat_fd = os.open(f"/proc/{pid}/stat", os.O_RDONLY)
+        self._statm_fd = os.open(f"/proc/{pid}/statm", os.O_RDONLY)
+        self._last = None  # (time, cumulative CPU seconds) at the previous sample
+    
+    def read(self, now):
+        """Return (CPU %, RSS bytes); raises ProcessLookupError once the process is gone"""
+        stat = os.pread(self._stat_fd, 1024, 0)
+        # The command name may contain spaces, so split after its closing paren;
+        # state, utime and stime are fields 3, 14 and 15 of the stat line
+        fields = stat[stat.rindex(b')') + 2:].split()
+        if fields[0] == b'Z':
+            raise ProcessLookupError
+        cpu_time = (int(fields[11]) + int(fields[12])) / self.CLOCK_TICKS
+        rss = int(os.pread(self._statm_fd, 128, 0).split()[1]) * self.PAGE_SIZE
+        
+        # Like psutil's cpu_percent(), the first sample has no interval and reports 0
+        cpu_percent = 0.0
+        if self._last is not None and now > self._last[0]:
+            cpu_percent = (cpu_time - self._last[1]) / (now - self._last[0]) * 100
+        self._last = (now, cpu_time)
+        return cpu_percent, rss
+    
+    def close(self):
+        os.close(self._stat_fd)
+        os.close(self._statm_fd)
+
 class PerformanceCollector:
     def __init__(self, target_pid=None, duration=60):  # Default 60 seconds
         self.duration = duration
         self.target_pid = target_pid
-        self.timestamps = []
-        self.cpu_usage = []
-        self.memory_usage = []
+        
+        # Samples are written by index into preallocated buffers (one slot per 100ms tick)
+        self._cap = int(duration / 0.1) + 16
+        self.n_samples = 0
+        self.timestamps = np.zeros(self._cap, dtype=np.float32)
+        self.cpu_usage = np.zeros(self._cap, dtype=np.float32)
+        self.memory_usage = np.zeros(self._cap, dtype=np.float32)
+        
+        # Welford running mean / sum of squared deviations of CPU usage
+        self._cpu_mean = 0.0
+        self._cpu_m2 = 0.0
         self.output_dir = "docs/performance_data"
         
         # Create output directory if it doesn't exist
@@ -20,7 +76,7 @@ class PerformanceCollector:
             os.makedirs(self.output_dir)
     
     def collect_metrics(self):
-        start_time = time.time()
+        start_time = time.monotonic()
         try:
             # If target_pid is provided, monitor that process, otherwise monitor self
             process = psutil.Process(self.target_pid) if self.target_pid else psutil.Process()
@@ -29,60 +85,94 @@ class PerformanceCollector:
             print(f"Error: Process with PID {self.target_pid} not found!")
             return
         
-        while time.time() - start_time < self.duration:
-            try:
-                self.timestamps.append(time.time() - start_time)
-                self.cpu_usage.append(process.cpu_percent())
-                self.memory_usage.append(process.memory_info().rss / 1024 / 1024)  # MB
-                time.sleep(0.1)  # Sample every 100ms
-            except psutil.NoSuchProcess:
-                print(f"Process {self.target_pid} has terminated.")
-                break
+        # On Linux read /proc directly; elsewhere go through psutil
+        reader = None
+        if os.path.exists(f"/proc/{process.pid}/stat"):
+            reader = _ProcStatReader(process.pid)
+        
+        # Sample every 100ms against absolute deadlines so the time spent
+        # collecting doesn't stretch the interval
+        deadline = start_time
+        try:
+            while deadline - start_time < self.duration and self.n_samples < self._cap:
+                i = self.n_samples
+                now = time.monotonic()
+                try:
+                    if reader is not None:
+                        cpu_percent, rss = reader.read(now)
+                    else:
+                        cpu_percent, rss = process.cpu_percent(), process.memory_info().rss
+                except (psutil.NoSuchProcess, ProcessLookupError):
+                    print(f"Process {self.target_pid} has terminated.")
+                    break
+                self.timestamps[i] = now - start_time
+                self.cpu_usage[i] = cpu_percent
+                self.memory_usage[i] = rss / 1024 / 1024  # MB
+                self.n_samples += 1
+                
+                delta = cpu_percent - self._cpu_mean
+                self._cpu_mean += delta / self.n_samples
+                self._cpu_m2 += delta * (cpu_percent - self._cpu_mean)
+                
+                deadline += 0.1
+                time.sleep(max(0.0, deadline - time.monotonic()))
+        finally:
+            if reader is not None:
+                reader.close()
     
     def generate_plots(self):
-        # CPU Usage Plot
-        plt.figure(figsize=(10, 6))
-        plt.plot(self.timestamps, self.cpu_usage)
-        plt.title('CPU Usage Over Time')
-        plt.xlabel('Time (seconds)')
-        plt.ylabel('CPU Usage (%)')
-        plt.grid(True)
-        plt.savefig(f"{self.output_dir}/cpu_usage.png")
-        plt.close()
-        
-        # Memory Usage Plot
-        plt.figure(figsize=(10, 6))
-        plt.plot(self.timestamps, self.memory_usage)
-        plt.title('Memory Usage Over Time')
-        plt.xlabel('Time (seconds)')
-        plt.ylabel('Memory Usage (MB)')
-        plt.grid(True)
-        plt.savefig(f"{self.output_dir}/memory_usage.png")
-        plt.close()
+        n = self.n_samples
+        timestamps = self.timestamps[:n]
+        cpu_usage = self.cpu_usage[:n]
+        memory_usage = self.memory_usage[:n]
+        
+        # Split long paths into chunks so Agg doesn't stall on large runs
+        plt.rcParams['agg.path.chunksize'] = 10000
+        
+        # (file name, series, title, y label) for each single-series plot
+        plots = [
+            ('cpu_usage', cpu_usage, 'CPU Usage Over Time', 'CPU Usage (%)'),
+            ('memory_usage', memory_usage, 'Memory Usage Over Time', 'Memory Usage (MB)')
+        ]
+        
+        # Reuse one figure for the single-series plots
+        fig, ax = plt.subplots(figsize=(10, 6))
+        for name, series, title, ylabel in plots:
+            ax.clear()
+            ax.plot(*_decimate(timestamps, series))
+            ax.set(title=title, xlabel='Time (seconds)', ylabel=ylabel)
+            ax.grid(True)
+            fig.savefig(f"{self.output_dir}/{name}.png")
+        plt.close(fig)
         
         # Combined Metrics Plot
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
         
-        ax1.plot(self.timestamps, self.cpu_usage, 'b-', label='CPU Usage')
+        ax1.plot(*_decimate(timestamps, cpu_usage), 'b-', label='CPU Usage')
         ax1.set_ylabel('CPU Usage (%)')
         ax1.grid(True)
         ax1.legend()
         
-        ax2.plot(self.timestamps, self.memory_usage, 'r-', label='Memory Usage')
+        ax2.plot(*_decimate(timestamps, memory_usage), 'r-', label='Memory Usage')
         ax2.set_xlabel('Time (seconds)')
         ax2.set_ylabel('Memory Usage (MB)')
         ax2.grid(True)
         ax2.legend()
         
-        plt.tight_layout()
-        plt.savefig(f"{self.output_dir}/combined_metrics.png")
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(f"{self.output_dir}/combined_metrics.png")
+        plt.close(fig)
     
     def generate_report(self):
-        avg_cpu = np.mean(self.cpu_usage)
-        max_cpu = np.max(self.cpu_usage)
-        avg_memory = np.mean(self.memory_usage)
-        max_memory = np.max(self.memory_usage)
+        n = self.n_samples
+        cpu_usage = self.cpu_usage[:n]
+        memory_usage = self.memory_usage[:n]
+        
+        # Reduce both series together: one mean and one max over a 2 x n matrix
+        samples = np.stack((cpu_usage, memory_usage))
+        avg_cpu, avg_memory = samples.mean(axis=1)
+        max_cpu, max_memory = samples.max(axis=1)
+        cpu_std = math.sqrt(self._cpu_m2 / n)  # Population std, as np.std
         
         report = f"""# Real Performance Analysis Report
 Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
@@ -92,12 +182,12 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 ### CPU Usage
 - Average CPU Usage: {avg_cpu:.2f}%
 - Peak CPU Usage: {max_cpu:.2f}%
-- CPU Usage Pattern: {'Stable' if np.std(self.cpu_usage) < 5 else 'Variable'}
+- CPU Usage Pattern: {'Stable' if cpu_std < 5 else 'Variable'}
 
 ### Memory Usage
 - Average Memory Usage: {avg_memory:.2f} MB
 - Peak Memory Usage: {max_memory:.2f} MB
-- Memory Growth Rate: {(self.memory_usage[-1] - self.memory_usage[0])/self.duration:.2f} MB/s
+- Memory Growth Rate: {(memory_usage[-1] - memory_usage[0])/self.duration:.2f} MB/s
 
 ## Performance Visualizations
 ![CPU Usage](cpu_usage.png)
@@ -117,7 +207,7 @@ def main():
     print(f"Starting performance data collection{f' for PID {target_pid}' if target_pid else ''}...")
     collector.collect_metrics()
     
-    if collector.timestamps:  # Only generate reports if we collected data
+    if collector.n_samples:  # Only generate reports if we collected data
         print("Generating performance plots...")
         collector.generate_plots()
         print("Generating performance report...")
@@ -1,53 +1,134 @@
 import subprocess
+import os
+import errno
 import logging
 import socket
+import select
+import time
+import asyncio
+import aiohttp
 import requests
-from typing import Dict
+from requests.adapters import HTTPAdapter
+from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+OKX_TIME_URL = "https://www.okx.com/api/v5/public/time"
+
 class VPNHandler:
     def __init__(self):
         self.connected = False
         self.target_ip = "47.241.99.110"  # OKX API server
+        self.probe_timeout = 3.0  # Seconds to wait for the TCP handshake (covers a SYN retransmit)
+        
+        # Pooled keep-alive session so repeated checks reuse the TCP/TLS handshake
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Last API access result and when it was taken (monotonic seconds)
+        self.api_check_ttl = 5.0
+        self._last_check_ts = None
+        self._last_check_result = False
         
     def check_connection(self) -> Dict[str, bool]:
         """Check if VPN is connected and can reach OKX"""
+        # Non-blocking connect to the IP literal: no address lookup, and the
+        # wait is bounded by probe_timeout rather than the OS connect timeout
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
-            # Try to reach OKX server
-            socket.create_connection((self.target_ip, 80), timeout=5)
+            sock.setblocking(False)
+            err = sock.connect_ex((self.target_ip, 80))
+            if err in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                _, writable, _ = select.select([], [sock], [], self.probe_timeout)
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) if writable else errno.ETIMEDOUT
+        except OSError as e:
+            err = e.errno
+        finally:
+            sock.close()
+        
+        if err == 0:
             self.connected = True
             logger.info("VPN connection verified")
             return {"status": True, "message": "Connected to OKX network"}
-        except (socket.timeout, socket.error) as e:
-            self.connected = False
-            logger.error(f"VPN connection failed: {str(e)}")
-            return {"status": False, "message": "Cannot reach OKX network. Please check VPN connection"}
+        
+        self.connected = False
+        logger.error(f"VPN connection failed: {os.strerror(err) if err else 'unknown error'}")
+        return {"status": False, "message": "Cannot reach OKX network. Please check VPN connection"}
     
     def verify_api_access(self) -> bool:
-        """Verify if we can access OKX API"""
+        """Verify if we can access OKX API (cached for api_check_ttl seconds)"""
+        cached = self._cached_api_access()
+        if cached is not None:
+            return cached
+        
         try:
-            response = requests.get("https://www.okx.com/api/v5/public/time", timeout=5)
-            return response.status_code == 200
+            response = self.session.get(OKX_TIME_URL, timeout=5)
+            result = response.status_code == 200
         except Exception as e:
             logger.error(f"API access verification failed: {str(e)}")
-            return False
+            result = False
+        return self._store_api_access(result)
+    
+    def _cached_api_access(self) -> Optional[bool]:
+        """Last API access result if it is younger than api_check_ttl, else None"""
+        if self._last_check_ts is not None and time.monotonic() - self._last_check_ts < self.api_check_ttl:
+            return self._last_check_result
+        return None
+    
+    def _store_api_access(self, result: bool) -> bool:
+        """Cache an API access result and return it"""
+        self._last_check_ts = time.monotonic()
+        self._last_check_result = result
+        return result
     
     def get_connection_info(self) -> Dict[str, str]:
         """Get current connection information"""
+        return asyncio.run(self.get_connection_info_async())
+    
+    async def get_connection_info_async(self) -> Dict[str, str]:
+        """Get current connection information, running all three checks concurrently"""
+        loop = asyncio.get_running_loop()
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
+            ip, api_access, _ = await asyncio.gather(
+                self._fetch_public_ip(session),
+                self._verify_api_access_async(session),
+                loop.run_in_executor(None, self.check_connection)
+            )
+        
+        if ip is None:
+            return {
+                "ip": "Unknown",
+                "vpn_status": "Error",
+                "api_access": "Unknown"
+            }
+        return {
+            "ip": ip,
+            "vpn_status": "Connected" if self.connected else "Disconnected",
+            "api_access": "Available" if api_access else "Unavailable"
+        }
+    
+    async def _fetch_public_ip(self, session: aiohttp.ClientSession) -> Optional[str]:
+        """Look up our public IP, or None if the lookup fails"""
         try:
-            response = requests.get("https://api.ipify.org?format=json", timeout=5)
-            if response.status_code == 200:
-                return {
-                    "ip": response.json()["ip"],
-                    "vpn_status": "Connected" if self.connected else "Disconnected",
-                    "api_access": "Available" if self.verify_api_access() else "Unavailable"
-                }
+            async with session.get("https://api.ipify.org?format=json") as response:
+                if response.status == 200:
+                    return (await response.json())["ip"]
         except Exception as e:
             logger.error(f"Error getting connection info: {str(e)}")
+        return None
+    
+    async def _verify_api_access_async(self, session: aiohttp.ClientSession) -> bool:
+        """Async counterpart of verify_api_access, sharing its cache"""
+        cached = self._cached_api_access()
+        if cached is not None:
+            return cached
         
-        return {
-            "ip": "Unknown",
-            "vpn_status": "Error",
-            "api_access": "Unknown"
-        } 
\ No newline at end of file
+        try:
+            async with session.get(OKX_TIME_URL) as response:
+                result = response.status == 200
+        except Exception as e:
+            logger.error(f"API access verification failed: {str(e)}")
+            result = False
+        return self._store_api_access(result)